@@ -1,86 +1,121 @@
-from typing import Callable
+import functools
+from typing import Callable, Iterable
 
 from endstone import Player
 
 HEAD = "{"
 TAIL = "}"
+SEPARATOR = "|"
 
+# a template is split into literal chunks and (identifier, params, original) placeholders,
+# params being None when the placeholder was written without a separator
+Token = str | tuple[str, str | None, str]
 
-def apply(
-        player: Player | None,
-        text: str,
-        lookup: dict[str, Callable[[Player, str], str]],
-) -> str:
-    builder = []
+
+# templates such as scoreboard lines are usually sent again and again, so keep their tokens around
+@functools.lru_cache(maxsize=512)
+def tokenize(text: str) -> tuple[Token, ...]:
+    tokens = []
+    static = []
     i = 0
     length = len(text)
 
-    while i < length:
-        l = text[i]
-        if l != HEAD or i + 1 >= length:
-            builder.append(l)
-            i += 1
+    # bound methods hoisted into locals for the loop below
+    find = text.find
+    add_static = static.append
+
+    while True:
+        head = find(HEAD, i)
+        if head < 0 or head + 1 >= length:
+            add_static(text[i:])
+            break
+
+        tail = find(TAIL, head + 1)
+        end = tail if tail >= 0 else length
+
+        # a space in the identifier means this is not a placeholder,
+        # keep everything up to and including the space and rescan after it
+        separator = find(SEPARATOR, head + 1, end)
+        space = find(" ", head + 1, separator if separator >= 0 else end)
+        if space >= 0:
+            add_static(text[i:space + 1])
+            i = space + 1
             continue
 
-        identified = False
-        invalid = True
-        had_space = False
-        identifier_chars = []
-        parameters_chars = []
-
-        i += 1
-
-        while i < length:
-            p = text[i]
-            if p == " " and not identified:
-                had_space = True
-                break
-            if p == TAIL:
-                invalid = False
-                break
-            if p == "|" and not identified:
-                identified = True
-                i += 1
+        # unterminated, keep the rest as is
+        if tail < 0:
+            add_static(text[i:])
+            break
+
+        add_static(text[i:head])
+        tokens.append("".join(static))
+        static.clear()
+
+        if separator < 0:
+            tokens.append((text[head + 1:tail], None, text[head:tail + 1]))
+        else:
+            tokens.append((text[head + 1:separator], text[separator + 1:tail], text[head:tail + 1]))
+        i = tail + 1
+
+    tokens.append("".join(static))
+    return tuple(token for token in tokens if token)
+
+
+def render(
+        player: Player | None,
+        tokens: Iterable[Token],
+        lookup: dict[str, Callable[[Player, str], str]],
+        noparam_lookup: dict[str, Callable[[Player], str]] | None = None,
+        buffers: list[list[str]] | None = None,
+) -> str:
+    # take a spare buffer from the pool instead of allocating one per call,
+    # processors may render recursively so each call still gets its own
+    builder = buffers.pop() if buffers else []
+
+    # bound methods hoisted into locals for the loop below
+    append = builder.append
+    lookup_get = lookup.get
+    noparam_get = noparam_lookup.get if noparam_lookup is not None else None
+
+    try:
+        for token in tokens:
+            if isinstance(token, str):
+                append(token)
                 continue
-            if identified:
-                parameters_chars.append(p)
+
+            identifier_str, parameters_str, original = token
+
+            # placeholders without params go through the single-argument table first
+            noparam = None
+            if parameters_str is None:
+                parameters_str = ""
+                if noparam_get is not None:
+                    noparam = noparam_get(identifier_str)
+
+            if noparam is not None:
+                replacement = noparam(player)
             else:
-                identifier_chars.append(p)
-            i += 1
-
-        identifier_str = "".join(identifier_chars)
-        parameters_str = "".join(parameters_chars)
-
-        if invalid:
-            builder.append(HEAD + identifier_str)
-            if identified:
-                builder.append(
-                    "|" + parameters_str
-                )
-            if had_space:
-                builder.append(" ")
-            i += 1
-            continue
+                placeholder = lookup_get(identifier_str)
+                replacement = None if placeholder is None else placeholder(player, parameters_str)
 
-        placeholder = lookup.get(identifier_str, None)
-        if placeholder is None:
-            builder.append(HEAD + identifier_str)
-            if identified:
-                builder.append("|")
-            builder.append(parameters_str + TAIL)
-            i += 1
-            continue
+            append(original if replacement is None else replacement)
+
+        return "".join(builder)
+    finally:
+        if buffers is not None:
+            builder.clear()
+            buffers.append(builder)
 
-        replacement = placeholder(player, parameters_str)
-        if replacement is None:
-            builder.append(HEAD + identifier_str)
-            if identified:
-                builder.append("|")
-            builder.append(parameters_str + TAIL)
-            i += 1
-            continue
 
-        builder.append(replacement)
-        i += 1
+def apply(
+        player: Player | None,
+        text: str,
+        lookup: dict[str, Callable[[Player, str], str]],
+        noparam_lookup: dict[str, Callable[[Player], str]] | None = None,
+        buffers: list[list[str]] | None = None,
+) -> str:
+    # nothing that looks like a placeholder, skip the scan
+    if HEAD not in text:
+        return text
 
-    return "".join(builder)
+    return render(player, tokenize(text), lookup, noparam_lookup, buffers)
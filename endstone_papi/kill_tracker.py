@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import heapq
 import time
-from typing import Dict, Optional
+from collections import defaultdict
+from typing import DefaultDict, Dict, Optional
 from endstone import Player
 
+# Combat timeouts are pure interval math, so use a clock that wall-clock adjustments can't move
+_now = time.monotonic
+
 
 class KillTracker:
     """Tracks player kills and killstreaks with combat timer."""
@@ -16,11 +21,15 @@ class KillTracker:
             combat_timeout: Time in seconds after which damage becomes invalid for kill credit (default: 10 seconds)
         """
         # Dictionary to store kill counts: {player_name: kill_count}
-        self._kills: Dict[str, int] = {}
+        self._kills: DefaultDict[str, int] = defaultdict(int)
         # Dictionary to store current killstreaks: {player_name: streak_count}
-        self._killstreaks: Dict[str, int] = {}
-        # Dictionary to track last damage dealt: {victim_name: (damager_name, timestamp)}
-        self._last_damage: Dict[str, tuple[str, float]] = {}
+        self._killstreaks: DefaultDict[str, int] = defaultdict(int)
+        # Dictionary to track last damage dealt: {victim_name: (damager_name, damager, timestamp)}
+        # The damager reference lets the killer be credited without looking them up by name
+        self._last_damage: Dict[str, tuple[str, Optional[Player], float]] = {}
+        # Min-heap of damage records ordered by time: [(timestamp, victim_name)]
+        # Entries superseded by newer damage are left in place and skipped on cleanup
+        self._damage_heap: list[tuple[float, str]] = []
         # Combat timeout in seconds
         self._combat_timeout = combat_timeout
     
@@ -32,12 +41,29 @@ class KillTracker:
             victim: The player who took damage
             damager: The player who dealt the damage
         """
-        victim_name = victim.name
-        damager_name = damager.name
-        current_time = time.time()
+        self.record_damage_by_name(victim.name, damager.name, damager=damager)
+    
+    def record_damage_by_name(
+            self,
+            victim_name: str,
+            damager_name: str,
+            now: Optional[float] = None,
+            damager: Optional[Player] = None,
+    ) -> None:
+        """
+        Record damage dealt by a player to another player, by their names.
+        
+        Args:
+            victim_name: The name of the player who took damage
+            damager_name: The name of the player who dealt the damage
+            now: time.monotonic() timestamp of the damage (default: the current time)
+            damager: The player who dealt the damage, if available
+        """
+        current_time = _now() if now is None else now
         
         # Record the damage with timestamp
-        self._last_damage[victim_name] = (damager_name, current_time)
+        self._last_damage[victim_name] = (damager_name, damager, current_time)
+        heapq.heappush(self._damage_heap, (current_time, victim_name))
     
     def get_valid_killer(self, victim: Player) -> Optional[str]:
         """
@@ -50,21 +76,60 @@ class KillTracker:
         Returns:
             The name of the killer if damage is recent enough, None otherwise
         """
-        victim_name = victim.name
+        return self.get_valid_killer_by_name(victim.name)
+    
+    def get_valid_killer_by_name(self, victim_name: str) -> Optional[str]:
+        """
+        Get the name of the player who should receive kill credit, if any.
+        Returns None if the last damage is too old or doesn't exist.
         
-        if victim_name not in self._last_damage:
+        Args:
+            victim_name: The name of the player who died
+            
+        Returns:
+            The name of the killer if damage is recent enough, None otherwise
+        """
+        damager = self.get_valid_damager(victim_name)
+        return damager[0] if damager is not None else None
+    
+    def get_valid_damager(self, victim_name: str) -> Optional[tuple[str, Optional[Player]]]:
+        """
+        Get the player who should receive kill credit, if any.
+        Returns None if the last damage is too old or doesn't exist.
+        
+        Args:
+            victim_name: The name of the player who died
+            
+        Returns:
+            A tuple of the killer's name and the recorded player (None if it was not recorded
+            or the player has left since) if damage is recent enough, None otherwise
+        """
+        record = self._last_damage.get(victim_name)
+        if record is None:
             return None
         
-        damager_name, damage_time = self._last_damage[victim_name]
-        current_time = time.time()
+        damager_name, damager, damage_time = record
+        current_time = _now()
         time_elapsed = current_time - damage_time
         
         # Check if the damage is still valid (within timeout)
         if time_elapsed <= self._combat_timeout:
-            return damager_name
+            return damager_name, damager
         
         return None
     
+    def forget_damager(self, player_name: str) -> None:
+        """
+        Drop the stored references to a player as a damager (called when they leave).
+        Their damage records are kept by name, so they can still be credited if they come back in time.
+        
+        Args:
+            player_name: The name of the player who left
+        """
+        for victim_name, (damager_name, damager, damage_time) in self._last_damage.items():
+            if damager is not None and damager_name == player_name:
+                self._last_damage[victim_name] = (damager_name, None, damage_time)
+    
     def add_kill(self, player: Player) -> None:
         """
         Add a kill to the player's count and increment their killstreak.
@@ -72,13 +137,20 @@ class KillTracker:
         Args:
             player: The player who got the kill
         """
-        player_name = player.name
+        self.add_kill_by_name(player.name)
+    
+    def add_kill_by_name(self, player_name: str) -> None:
+        """
+        Add a kill to the player's count and increment their killstreak.
         
+        Args:
+            player_name: The name of the player who got the kill
+        """
         # Increment total kills
-        self._kills[player_name] = self._kills.get(player_name, 0) + 1
+        self._kills[player_name] += 1
         
         # Increment killstreak
-        self._killstreaks[player_name] = self._killstreaks.get(player_name, 0) + 1
+        self._killstreaks[player_name] += 1
     
     def reset_killstreak(self, player: Player) -> None:
         """
@@ -87,7 +159,15 @@ class KillTracker:
         Args:
             player: The player whose killstreak should be reset
         """
-        player_name = player.name
+        self.reset_killstreak_by_name(player.name)
+    
+    def reset_killstreak_by_name(self, player_name: str) -> None:
+        """
+        Reset a player's killstreak (called when they die).
+        
+        Args:
+            player_name: The name of the player whose killstreak should be reset
+        """
         self._killstreaks[player_name] = 0
         
         # Clean up the damage record for this player
@@ -128,17 +208,28 @@ class KillTracker:
         self._killstreaks.pop(player_name, None)
         self._last_damage.pop(player_name, None)
     
+    @property
+    def pending_damage_records(self) -> int:
+        """
+        Get the number of damage records waiting for cleanup, including ones superseded by newer damage.
+        
+        Returns:
+            The number of pending damage records
+        """
+        return len(self._damage_heap)
+    
     def cleanup_old_damage_records(self) -> None:
         """
         Clean up damage records that are older than the combat timeout.
         This can be called periodically to free up memory.
         """
-        current_time = time.time()
-        expired_victims = [
-            victim_name
-            for victim_name, (_, damage_time) in self._last_damage.items()
-            if current_time - damage_time > self._combat_timeout
-        ]
-        
-        for victim_name in expired_victims:
-            del self._last_damage[victim_name]
\ No newline at end of file
+        current_time = _now()
+        heap = self._damage_heap
+        timeout = self._combat_timeout
+
+        # Only the expired entries at the top of the heap are touched
+        while heap and current_time - heap[0][0] > timeout:
+            damage_time, victim_name = heapq.heappop(heap)
+            record = self._last_damage.get(victim_name)
+            if record is not None and record[2] == damage_time:
+                del self._last_damage[victim_name]
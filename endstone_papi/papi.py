@@ -1,24 +1,102 @@
 from __future__ import annotations
 
 import datetime
+import operator
 import re
-from typing import Callable, TYPE_CHECKING
+import time
+from typing import Callable, Iterable, TYPE_CHECKING
 
 from endstone import Player
+from endstone.level import Dimension
 from endstone.plugin import Plugin
 
 from ._papi import PlaceholderAPI as IPlaceholderAPI
-from .chars_replacer import apply
+from .chars_replacer import apply, render, tokenize
 
 if TYPE_CHECKING:
     from .kill_tracker import KillTracker
 
+# [second, datetime] shared by all date/time placeholders within the same second
+_time_cache: list = [0, None]
+
+
+def _now() -> datetime.datetime:
+    t = int(time.time())
+    c = _time_cache
+    if c[0] != t or c[1] is None:
+        c[0] = t
+        c[1] = datetime.datetime.fromtimestamp(t)
+    return c[1]
+
+
+# {format: (second, formatted)}, strftime output only changes once a second
+_fmt_cache: dict[str, tuple[int, str]] = {}
+
+
+def _fmt(fmt: str) -> str:
+    now = _now()
+    sec = _time_cache[0]
+    hit = _fmt_cache.get(fmt)
+    if hit is not None and hit[0] == sec:
+        return hit[1]
+
+    s = now.strftime(fmt)
+    _fmt_cache[fmt] = (sec, s)
+    return s
+
+
+# str() of the small ints stats live in (kills, streaks, ping, levels), built once and shared
+_SMALL_INT_STR = tuple(str(i) for i in range(2048))
+
+
+def _istr(value: int) -> str:
+    return _SMALL_INT_STR[value] if 0 <= value < 2048 else str(value)
+
+
+# processor factories over operator.attrgetter, which resolves dotted paths in C
+def _attr(attr: str) -> Callable[[Player | None], str]:
+    return operator.attrgetter(attr)
+
+
+def _attr_str(attr: str) -> Callable[[Player | None], str]:
+    getter = operator.attrgetter(attr)
+    return lambda player: str(getter(player))
+
+
+def _attr_istr(attr: str) -> Callable[[Player | None], str]:
+    getter = operator.attrgetter(attr)
+    return lambda player: _istr(getter(player))
+
+
+def _attr_int_str(attr: str) -> Callable[[Player | None], str]:
+    getter = operator.attrgetter(attr)
+    return lambda player: str(int(getter(player)))
+
+
+def _attr_lower(attr: str) -> Callable[[Player | None], str]:
+    getter = operator.attrgetter(attr)
+    return lambda player: getter(player).lower()
+
+
+# lowercase dimension names built once, instead of a new str from .name.lower() on every call
+_DIM_STR: dict[Dimension.Type, str] = {t: t.name.lower() for t in Dimension.Type.__members__.values()}
+_dimension_type = operator.attrgetter("location.dimension.type")
+
+
+def _dimension_name(player: Player | None) -> str:
+    dimension_type = _dimension_type(player)
+    name = _DIM_STR.get(dimension_type)
+    return name if name is not None else dimension_type.name.lower()
+
 
 class PlaceholderAPI(IPlaceholderAPI):
     def __init__(self, plugin: Plugin):
         IPlaceholderAPI.__init__(self)
         self._plugin = plugin
         self._registry: dict[str, Callable[[Player | None, str], str]] = {}
+        self._noparam_registry: dict[str, Callable[[Player | None], str]] = {}
+        # spare string builders reused across set_placeholders calls
+        self._buffers: list[list[str]] = []
         self._placeholder_pattern = re.compile(r"[{]([^{}]+)[}]")
         self._register_default_placeholders()
 
@@ -39,7 +117,37 @@ class PlaceholderAPI(IPlaceholderAPI):
         Returns:
             str: String containing all translated placeholders.
         """
-        return apply(player, text, self._registry)
+        if "{" not in text:
+            return text
+
+        return apply(
+            player,
+            text,
+            self._registry,
+            self._noparam_registry,
+            self._buffers,
+        )
+
+    def set_placeholders_many(self, players: Iterable[Player | None], text: str) -> list[str]:
+        """
+        Translates all placeholders in one text for each of the given players.
+        The text is only parsed once, which is cheaper than calling set_placeholders per player.
+
+        Args:
+            players (Iterable[Player | None]): Players to parse the placeholders against.
+            text (str): Text to set the placeholder values in.
+
+        Returns:
+            list[str]: Translated strings, in the same order as players.
+        """
+        if "{" not in text:
+            return [text for _ in players]
+
+        tokens = tokenize(text)
+        registry = self._registry
+        noparam_registry = self._noparam_registry
+        buffers = self._buffers
+        return [render(player, tokens, registry, noparam_registry, buffers) for player in players]
 
     def is_registered(self, identifier: str) -> bool:
         """
@@ -89,13 +197,15 @@ class PlaceholderAPI(IPlaceholderAPI):
         Returns:
             bool: True if string contains any matches to the bracket placeholder pattern, False otherwise.
         """
-        return self._placeholder_pattern.search(text) is not None
+        return "{" in text and self._placeholder_pattern.search(text) is not None
 
     def register_placeholder(
             self,
             plugin: Plugin,
             identifier: str,
-            processor: Callable[[Player | None, str], str],
+            processor: Callable[[Player | None, str], str] | Callable[[Player | None], str],
+            *,
+            params: bool = True,
     ) -> bool:
         """
         Attempt to register a placeholder.
@@ -103,141 +213,167 @@ class PlaceholderAPI(IPlaceholderAPI):
         Args:
             plugin (Plugin): The plugin that is registering the placeholder.
             identifier (str): The identifier of the placeholder.
-            processor (Callable[[Player | None, str], str]): The processor that will process the placeholder.
+            processor (Callable[[Player | None, str], str] | Callable[[Player | None], str]): The processor that
+                will process the placeholder. Takes the player and params, or only the player when params is False.
+            params (bool): Whether the processor takes params. If False, the processor only takes the player
+                and is called directly whenever the placeholder is written without params. Defaults to True.
 
         Returns:
             bool: True if the placeholder was successfully registered, False otherwise.
         """
-        if self.is_registered(identifier):
+        entry = processor if params else lambda player, _: processor(player)
+
+        # setdefault only inserts when the identifier is free, the size tells whether it did
+        registry = self._registry
+        size = len(registry)
+        registry.setdefault(identifier, entry)
+        if len(registry) == size:
             # use the fallback identifier with plugin name as the namespace
             identifier = f"{plugin.name}:{identifier}"
 
-        if self.is_registered(identifier):
-            self._plugin.logger.warning(
-                f"Plugin '{plugin.name}' trying to register a duplicate placeholder: {identifier}"
-            )
-            return False
+            registry.setdefault(identifier, entry)
+            if len(registry) == size:
+                self._plugin.logger.warning(
+                    f"Plugin '{plugin.name}' trying to register a duplicate placeholder: {identifier}"
+                )
+                return False
 
-        self._registry[identifier] = processor
+        if not params:
+            self._noparam_registry[identifier] = processor
         return True
 
     def _register_default_placeholders(self):
         self.register_placeholder(
-            self._plugin, "x", lambda player, params: str(int(player.location.x))
+            self._plugin, "x", _attr_int_str("location.x"), params=False
         )
         self.register_placeholder(
-            self._plugin, "y", lambda player, params: str(int(player.location.y))
+            self._plugin, "y", _attr_int_str("location.y"), params=False
         )
         self.register_placeholder(
-            self._plugin, "z", lambda player, params: str(int(player.location.z))
+            self._plugin, "z", _attr_int_str("location.z"), params=False
         )
         self.register_placeholder(
-            self._plugin, "player_name", lambda player, params: player.name
+            self._plugin, "player_name", _attr("name"), params=False
         )
         self.register_placeholder(
             self._plugin,
             "dimension",
-            lambda player, params: player.location.dimension.type.name.lower(),
+            _dimension_name,
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "dimension_id",
-            lambda player, params: player.location.dimension.type.value,
+            _attr_str("location.dimension.type.value"),
+            params=False,
         )
         self.register_placeholder(
-            self._plugin, "ping", lambda player, params: str(player.ping)
+            self._plugin, "ping", _attr_istr("ping"), params=False
         )
         self.register_placeholder(
             self._plugin,
             "mc_version",
-            lambda player, params: self._plugin.server.minecraft_version,
+            lambda player: self._plugin.server.minecraft_version,
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "online",
-            lambda player, params: str(len(self._plugin.server.online_players)),
+            lambda player: _istr(len(self._plugin.server.online_players)),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "max_online",
-            lambda player, params: str(self._plugin.server.max_players),
+            lambda player: _istr(self._plugin.server.max_players),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "date",
-            lambda player, params: datetime.datetime.today().strftime("%x"),
+            lambda player: _fmt("%x"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "time",
-            lambda player, params: datetime.datetime.today().strftime("%X"),
+            lambda player: _fmt("%X"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "datetime",
-            lambda player, params: datetime.datetime.today().strftime("%c"),
+            lambda player: _fmt("%c"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "year",
-            lambda player, params: datetime.datetime.today().strftime("%Y"),
+            lambda player: _fmt("%Y"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "month",
-            lambda player, params: datetime.datetime.today().strftime("%m"),
+            lambda player: _fmt("%m"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "day",
-            lambda player, params: datetime.datetime.today().strftime("%d"),
+            lambda player: _fmt("%d"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "hour",
-            lambda player, params: datetime.datetime.today().strftime("%H"),
+            lambda player: _fmt("%H"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "minute",
-            lambda player, params: datetime.datetime.today().strftime("%M"),
+            lambda player: _fmt("%M"),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "second",
-            lambda player, params: datetime.datetime.today().strftime("%S"),
+            lambda player: _fmt("%S"),
+            params=False,
         )
         self.register_placeholder(
-            self._plugin, "address", lambda player, params: player.address
+            self._plugin, "address", _attr("address"), params=False
         )
         self.register_placeholder(
-            self._plugin, "runtime_id", lambda player, params: str(player.runtime_id)
+            self._plugin, "runtime_id", _attr_str("runtime_id"), params=False
         )
         self.register_placeholder(
-            self._plugin, "exp_level", lambda player, params: str(player.exp_level)
+            self._plugin, "exp_level", _attr_istr("exp_level"), params=False
         )
         self.register_placeholder(
-            self._plugin, "total_exp", lambda player, params: str(player.total_exp)
+            self._plugin, "total_exp", _attr_istr("total_exp"), params=False
         )
         self.register_placeholder(
-            self._plugin, "exp_progress", lambda player, params: str(player.exp_progress)
+            self._plugin, "exp_progress", _attr_str("exp_progress"), params=False
         )
         self.register_placeholder(
             self._plugin,
             "game_mode",
-            lambda player, params: player.game_mode.name.lower(),
+            _attr_lower("game_mode.name"),
+            params=False,
         )
         self.register_placeholder(
-            self._plugin, "xuid", lambda player, params: player.xuid
+            self._plugin, "xuid", _attr("xuid"), params=False
         )
         self.register_placeholder(
-            self._plugin, "uuid", lambda player, params: str(player.unique_id)
+            self._plugin, "uuid", _attr_str("unique_id"), params=False
         )
         self.register_placeholder(
-            self._plugin, "device_os", lambda player, params: player.device_os
+            self._plugin, "device_os", _attr("device_os"), params=False
         )
         self.register_placeholder(
-            self._plugin, "locale", lambda player, params: player.locale
+            self._plugin, "locale", _attr("locale"), params=False
         )
 
     def _register_kill_placeholders(self):
@@ -245,10 +381,12 @@ class PlaceholderAPI(IPlaceholderAPI):
         self.register_placeholder(
             self._plugin,
             "kills",
-            lambda player, params: str(self._kill_tracker.get_kills(player))
+            lambda player: _istr(self._kill_tracker.get_kills(player)),
+            params=False,
         )
         self.register_placeholder(
             self._plugin,
             "killstreak",
-            lambda player, params: str(self._kill_tracker.get_killstreak(player))
+            lambda player: _istr(self._kill_tracker.get_killstreak(player)),
+            params=False,
         )
\ No newline at end of file
@@ -1,6 +1,6 @@
 from endstone import Player
 from endstone.command import Command, CommandSender
-from endstone.event import event_handler, PlayerDeathEvent, EntityDamageByEntityEvent
+from endstone.event import event_handler, PlayerDeathEvent, PlayerQuitEvent, EntityDamageByEntityEvent
 from endstone.plugin import Plugin, ServicePriority
 
 from .papi import PlaceholderAPI
@@ -28,12 +28,20 @@ class PlaceholderAPIPlugin(Plugin):
         }
     }
 
+    # Minimum number of pending damage records before the periodic cleanup does any work
+    _CLEANUP_THRESHOLD = 32
+
     def __init__(self):
         super().__init__()
         self._api = PlaceholderAPI(self)
         # Initialize kill tracker with 10 second combat timeout
         # You can change this value to adjust how long damage is valid for kill credit
         self._kill_tracker = KillTracker(combat_timeout=10.0)
+        # /papi subcommands: {name: handler(sender, args) -> bool}
+        self._commands = {
+            "parse": self._command_parse,
+            "list": self._command_list,
+        }
 
     def on_load(self):
         self.server.service_manager.register(
@@ -49,7 +57,7 @@ class PlaceholderAPIPlugin(Plugin):
         # Schedule periodic cleanup of old damage records (every 30 seconds)
         self.server.scheduler.run_task(
             self,
-            lambda: self._kill_tracker.cleanup_old_damage_records(),
+            self._cleanup_damage_records,
             delay=600,  # 30 seconds in ticks (20 ticks = 1 second)
             period=600   # Repeat every 30 seconds
         )
@@ -57,65 +65,82 @@ class PlaceholderAPIPlugin(Plugin):
     def on_disable(self):
         self.server.service_manager.unregister_all(self)
 
+    def _cleanup_damage_records(self):
+        # A handful of records costs next to nothing to keep, only clean up once they pile up
+        if self._kill_tracker.pending_damage_records >= self._CLEANUP_THRESHOLD:
+            self._kill_tracker.cleanup_old_damage_records()
+
     @event_handler
     def on_entity_damage_by_entity(self, event: EntityDamageByEntityEvent):
         """Track damage dealt by players to other players."""
         # Check if both the victim and damager are players
-        if isinstance(event.entity, Player) and isinstance(event.damager, Player):
-            victim = event.entity
-            damager = event.damager
+        victim = event.entity
+        damager = event.damager
+        if isinstance(victim, Player) and isinstance(damager, Player):
+            # Fetch each name once, they are reused for the record
+            victim_name = victim.name
+            damager_name = damager.name
             
             # Don't track self-damage
-            if victim.name != damager.name:
-                self._kill_tracker.record_damage(victim, damager)
+            if victim_name != damager_name:
+                self._kill_tracker.record_damage_by_name(victim_name, damager_name, damager=damager)
 
     @event_handler
     def on_player_death(self, event: PlayerDeathEvent):
         """Handle player death to track kills and reset killstreaks."""
-        victim = event.entity
+        victim_name = event.entity.name
         
         # Get the valid killer (checks if damage is recent enough)
-        killer_name = self._kill_tracker.get_valid_killer(victim)
+        damager = self._kill_tracker.get_valid_damager(victim_name)
         
-        if killer_name:
-            # Get the killer player object
-            killer = self.server.get_player(killer_name)
+        if damager is not None:
+            killer_name, killer = damager
+            # Only look the killer up by name if the recorded reference was dropped
+            if killer is None:
+                killer = self.server.get_player(killer_name)
             if killer and killer.is_online:
                 # Add kill to the killer's count
-                self._kill_tracker.add_kill(killer)
+                self._kill_tracker.add_kill_by_name(killer_name)
         
         # Always reset the victim's killstreak
-        self._kill_tracker.reset_killstreak(victim)
+        self._kill_tracker.reset_killstreak_by_name(victim_name)
+
+    @event_handler
+    def on_player_quit(self, event: PlayerQuitEvent):
+        """Drop references to players who leave so they are never used while offline."""
+        self._kill_tracker.forget_damager(event.player.name)
 
     def on_command(
             self, sender: CommandSender, command: Command, args: list[str]
     ) -> bool:
-        match args[0]:
-            case "parse":
-                assert len(args) == 3, f"Invalid number of arguments! Expected 3, got {len(args)}."
-                match args[1]:
-                    case "me":
-                        if not isinstance(sender, Player):
-                            sender.send_error_message("You must be a player to use 'me' as a target!")
-                            return True
-
-                        player = sender
-
-                    case "--null":
-                        player = None
-
-                    case player_name:
-                        player = self.server.get_player(player_name)
-                        if player is None:
-                            sender.send_error_message(f"Could not find player {player_name}!")
-                            return True
-
-                text: str = args[2]
-                sender.send_message(self._api.set_placeholders(player, text))
-
-            case "list":
-                sender.send_message("Available placeholders:")
-                for identifier in self._api.registered_identifiers:
-                    sender.send_message(f"- {identifier}")
-
-        return True
\ No newline at end of file
+        handler = self._commands.get(args[0])
+        return handler(sender, args) if handler is not None else False
+
+    def _command_parse(self, sender: CommandSender, args: list[str]) -> bool:
+        assert len(args) == 3, f"Invalid number of arguments! Expected 3, got {len(args)}."
+        match args[1]:
+            case "me":
+                if not isinstance(sender, Player):
+                    sender.send_error_message("You must be a player to use 'me' as a target!")
+                    return True
+
+                player = sender
+
+            case "--null":
+                player = None
+
+            case player_name:
+                player = self.server.get_player(player_name)
+                if player is None:
+                    sender.send_error_message(f"Could not find player {player_name}!")
+                    return True
+
+        text: str = args[2]
+        sender.send_message(self._api.set_placeholders(player, text))
+        return True
+
+    def _command_list(self, sender: CommandSender, args: list[str]) -> bool:
+        sender.send_message("Available placeholders:")
+        for identifier in self._api.registered_identifiers:
+            sender.send_message(f"- {identifier}")
+        return True